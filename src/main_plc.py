@@ -1,13 +1,15 @@
+import os
 import sys
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget,
     QHBoxLayout, QVBoxLayout, QPushButton,
-    QLabel, QGraphicsView, QGraphicsScene
+    QLabel, QGraphicsView, QGraphicsScene,
+    QGraphicsItem, QStyle
 )
-from PyQt5.QtCore import Qt, QMimeData, QPointF, QByteArray
+from PyQt5.QtCore import Qt, QMimeData, QPointF, QRectF, QByteArray, QTimer
 from PyQt5.QtGui import (
     QDrag, QBrush, QPen, QFont, QColor,
-    QPainter
+    QPainter, QPainterPath, QPicture, QPixmap
 )
 
 from session import LadderSession  # usamos la versión con grid[row][col]
@@ -15,6 +17,122 @@ from session import LadderSession  # usamos la versión con grid[row][col]
 
 MIME_BLOCK_TYPE = "application/x-plc-block"
 
+# Tipos de bloque disponibles y tamaño fijo de cada símbolo
+BLOCK_TYPES = ("XIC", "XIO", "OTE", "OTL", "OTU", "TON")
+BLOCK_WIDTH = 120
+BLOCK_HEIGHT = 50
+# Offset del centro de un bloque respecto de su origen (0, 0)
+_BLOCK_W_HALF = BLOCK_WIDTH / 2
+_BLOCK_H_HALF = BLOCK_HEIGHT / 2
+
+# PLC_FULL_VIEWPORT_UPDATE=1 vuelve a redibujar todo el viewport en cada cambio
+FULL_VIEWPORT_UPDATE = os.environ.get("PLC_FULL_VIEWPORT_UPDATE") == "1"
+
+# Estilos compartidos; se crean en _init_styles() porque QFont necesita
+# que ya exista la QApplication
+_COLOR_BACKGROUND = None
+_COLOR_WHITE = None
+_PEN_WHITE = None
+_PEN_WHITE_2 = None
+_BRUSH_BLOCK = None
+_PEN_RAIL = None
+_PEN_RUNG = None
+_PEN_SELECTED = None
+_FONT_COIL = None
+_FONT_TIMER = None
+
+
+def _contact_path(normally_closed: bool) -> QPainterPath:
+    """Trazos del contacto (dos verticales y, si es NC, la diagonal) en un path."""
+    cx = BLOCK_WIDTH / 2
+    y1 = BLOCK_HEIGHT * 0.2
+    y2 = BLOCK_HEIGHT * 0.8
+    offset = 20
+
+    path = QPainterPath()
+    path.moveTo(cx - offset, y1)
+    path.lineTo(cx - offset, y2)
+    path.moveTo(cx + offset, y1)
+    path.lineTo(cx + offset, y2)
+    if normally_closed:
+        path.moveTo(cx - offset, y1)
+        path.lineTo(cx + offset, y2)
+    return path
+
+
+def _coil_path() -> QPainterPath:
+    """Círculo central de la bobina (OTE/OTL/OTU)."""
+    radius = 14
+    path = QPainterPath()
+    path.addEllipse(QPointF(BLOCK_WIDTH / 2, BLOCK_HEIGHT / 2), radius, radius)
+    return path
+
+
+def _timer_path() -> QPainterPath:
+    """Recuadro interno tipo "módulo" del timer."""
+    margin = 10
+    path = QPainterPath()
+    path.addRect(QRectF(
+        margin, margin,
+        BLOCK_WIDTH - 2 * margin, BLOCK_HEIGHT - 2 * margin
+    ))
+    return path
+
+
+# Plantillas de trazos por tipo de símbolo (geometría fija, se arman una vez)
+_PATH_XIC = _contact_path(False)
+_PATH_XIO = _contact_path(True)
+_PATH_COIL = _coil_path()
+_PATH_TON = _timer_path()
+
+
+def _init_styles():
+    """Crea (una sola vez) los QPen/QBrush/QFont/QColor usados al dibujar."""
+    global _COLOR_BACKGROUND, _COLOR_WHITE, _PEN_WHITE, _PEN_WHITE_2, _BRUSH_BLOCK
+    global _PEN_RAIL, _PEN_RUNG, _PEN_SELECTED, _FONT_COIL, _FONT_TIMER
+    if _PEN_WHITE is not None:
+        return
+
+    _COLOR_BACKGROUND = QColor("#1e1e1e")
+    _COLOR_WHITE = QColor("#ffffff")
+
+    _PEN_WHITE = QPen(_COLOR_WHITE)
+    _PEN_WHITE_2 = QPen(_COLOR_WHITE)
+    _PEN_WHITE_2.setWidth(2)
+    _BRUSH_BLOCK = QBrush(QColor("#2d2d30"))
+
+    _PEN_RAIL = QPen(QColor("#bbbbbb"))
+    _PEN_RAIL.setWidth(2)
+    _PEN_RUNG = QPen(QColor("#888888"))
+    _PEN_RUNG.setWidth(1)
+    _PEN_SELECTED = QPen(QColor("#ffcc00"))
+    _PEN_SELECTED.setStyle(Qt.DashLine)
+
+    _FONT_COIL = QFont("Segoe UI", 7, QFont.Bold)
+    _FONT_TIMER = QFont("Segoe UI", 9, QFont.Bold)
+
+
+class _BlockItem(QGraphicsItem):
+    """
+    Bloque ladder liviano: reproduce el QPicture del símbolo de su tipo.
+    Todos los bloques del mismo tipo comparten el mismo prototipo inmutable.
+    """
+    _BOUNDS = QRectF(0, 0, BLOCK_WIDTH, BLOCK_HEIGHT)
+
+    def __init__(self, prototype: QPicture, parent=None):
+        super().__init__(parent)
+        self._proto = prototype
+
+    def boundingRect(self) -> QRectF:
+        return self._BOUNDS
+
+    def paint(self, painter, option, widget=None):
+        painter.drawPicture(0, 0, self._proto)
+        if option.state & QStyle.State_Selected:
+            painter.setPen(_PEN_SELECTED)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(QRectF(0.5, 0.5, BLOCK_WIDTH - 1, BLOCK_HEIGHT - 1))
+
 
 class DraggableButton(QPushButton):
     """
@@ -23,9 +141,32 @@ class DraggableButton(QPushButton):
     """
     def __init__(self, text, block_type, parent=None):
         super().__init__(text, parent)
+        _init_styles()
         self.block_type = block_type
+        # Payload del drag y miniatura: se arman una sola vez por botón
+        self._block_type_bytes = QByteArray(block_type.encode("utf-8"))
+        self._preview = self._render_preview()
+        self._drag_distance = QApplication.startDragDistance()
         self._drag_start_pos = None
 
+    def _render_preview(self) -> QPixmap:
+        """Miniatura del bloque que acompaña al cursor durante el drag."""
+        width = 60
+        height = 24
+        pixmap = QPixmap(width, height)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setPen(_PEN_WHITE)
+        painter.setBrush(_BRUSH_BLOCK)
+        painter.drawRect(QRectF(0.5, 0.5, width - 1, height - 1))
+        painter.setFont(self.font())
+        painter.drawText(QRectF(0, 0, width, height), Qt.AlignCenter, self.block_type)
+        painter.end()
+
+        return pixmap
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self._drag_start_pos = event.pos()
@@ -38,15 +179,17 @@ class DraggableButton(QPushButton):
         if self._drag_start_pos is None:
             return
 
-        # Distancia mínima para considerar que es un drag
-        if (event.pos() - self._drag_start_pos).manhattanLength() < 10:
+        # Distancia mínima para considerar que es un drag (la del sistema)
+        if (event.pos() - self._drag_start_pos).manhattanLength() < self._drag_distance:
             return
 
         # Iniciar el drag
         drag = QDrag(self)
         mime_data = QMimeData()
-        mime_data.setData(MIME_BLOCK_TYPE, QByteArray(self.block_type.encode("utf-8")))
+        mime_data.setData(MIME_BLOCK_TYPE, self._block_type_bytes)
         drag.setMimeData(mime_data)
+        drag.setPixmap(self._preview)
+        drag.setHotSpot(self._preview.rect().center())
 
         drag.exec_(Qt.CopyAction)
 
@@ -60,17 +203,37 @@ class WorkspaceView(QGraphicsView):
     - Borrado de bloques seleccionados (botón o tecla Delete/Backspace).
     """
 
+    # block_type -> QPicture con el símbolo ya grabado (compartido entre vistas)
+    _prototypes: dict[str, QPicture] = {}
+
+    # payload MIME (bytes) -> block_type, fija para los tipos conocidos
+    _BLOCK_TYPES: dict[bytes, str] = {t.encode(): t for t in BLOCK_TYPES}
+
     def __init__(self, session: LadderSession, parent=None):
         super().__init__(parent)
+        _init_styles()
 
         self.session = session  # sesión lógica
 
-        scene = QGraphicsScene(self)
-        self.setScene(scene)
+        # Referencia Python a la escena: evita cruzar a C++ con self.scene() en cada uso
+        self._scene = QGraphicsScene(self)
+        self.setScene(self._scene)
+        # Escena chica y casi estática: sin índice BSP (evita reconstruirlo en cada setPos)
+        self._scene.setItemIndexMethod(QGraphicsScene.NoIndex)
 
         self.setRenderHint(QPainter.Antialiasing, True)
+        # Ladder disperso: repintar sólo la unión de rects sucios (unos pocos bloques)
+        # en vez de todo el viewport; FullViewportUpdate queda como alternativa
+        if FULL_VIEWPORT_UPDATE:
+            self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        else:
+            self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
+        self.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing, True)
         self.setAcceptDrops(True)
-        self.setBackgroundBrush(QColor("#1e1e1e"))
+        self.setBackgroundBrush(_COLOR_BACKGROUND)
+        # Fondo + rieles + rungs no cambian: se rasterizan una vez y se reutilizan
+        self.setCacheMode(QGraphicsView.CacheBackground)
         self.setFocusPolicy(Qt.ClickFocus)  # para recibir teclas al hacer click
 
         # Parámetros de la grilla lógica (coherentes con LadderSession)
@@ -82,10 +245,50 @@ class WorkspaceView(QGraphicsView):
         self.base_x = 140       # centro de la primera columna
         self.col_width = 140    # distancia entre columnas
 
+        # Inversas cacheadas: row_from_y / col_from_x multiplican en vez de dividir
+        self._inv_row_height = 1.0 / self.row_height
+        self._inv_col_width = 1.0 / self.col_width
+
+        # Centros precalculados de cada columna / renglón
+        self._col_centers = [self.base_x + c * self.col_width for c in range(self.max_cols)]
+        self._row_centers = [self.base_y + r * self.row_height for r in range(self.num_rows)]
+
         # Mapa id -> QGraphicsItem
         self.items_by_id: dict[int, object] = {}
 
-        # Dibujar los rieles y renglones tipo ladder
+        # Filas a reacomodar al final del evento en curso (ver _flush_layout)
+        self._dirty_rows: set[int] = set()
+
+        # Bloque presionado (se suelta en mouseReleaseEvent)
+        self._drag_block = None
+
+        # Resultado de hasFormat() cacheado en dragEnterEvent
+        self._drag_accepted = False
+
+        # block_type -> función que dibuja el símbolo sobre un QPainter
+        self._symbol_painters = {
+            "XIC": self._paint_contact,
+            "XIO": lambda painter: self._paint_contact(painter, normally_closed=True),
+            "OTE": lambda painter: self._paint_coil(painter, "OTE"),
+            "OTL": lambda painter: self._paint_coil(painter, "OTL"),
+            "OTU": lambda painter: self._paint_coil(painter, "OTU"),
+            "TON": self._paint_timer,
+        }
+
+        # Pre-renderizar los símbolos una sola vez
+        self._prerender_symbols()
+
+        # Último tamaño / encuadre aplicados (para no repetir fitInView)
+        self._last_size = None
+        self._last_fit = None
+
+        # Debounce de resizeEvent -> _fit_to_view (~un frame)
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(16)
+        self._resize_timer.timeout.connect(self._fit_to_view)
+
+        # Rieles y renglones tipo ladder (se pintan en drawBackground)
         self._create_ladder_rungs()
 
         # Ajustar vista inicial al contenido
@@ -95,7 +298,7 @@ class WorkspaceView(QGraphicsView):
     # Dibujar ladder: rieles y rungs
     # ------------------------------------------------------------------
     def _create_ladder_rungs(self):
-        scene = self.scene()
+        scene = self._scene
 
         # Posición de los rieles en X en función de las columnas
         self.rail_x_left = self.base_x - 80
@@ -105,43 +308,23 @@ class WorkspaceView(QGraphicsView):
         top_y = self.base_y - self.row_height
         bottom_y = self.base_y + (self.num_rows) * self.row_height
 
-        pen_rail = QPen(QColor("#bbbbbb"))
-        pen_rail.setWidth(2)
-
-        # Riel izquierdo
-        left_rail = scene.addLine(
-            self.rail_x_left, top_y,
-            self.rail_x_left, bottom_y,
-            pen_rail
-        )
-        left_rail.setZValue(-10)
-        left_rail.setFlag(left_rail.ItemIsSelectable, False)
-        left_rail.setFlag(left_rail.ItemIsMovable, False)
-
-        # Riel derecho
-        right_rail = scene.addLine(
-            self.rail_x_right, top_y,
-            self.rail_x_right, bottom_y,
-            pen_rail
-        )
-        right_rail.setZValue(-10)
-        right_rail.setFlag(right_rail.ItemIsSelectable, False)
-        right_rail.setFlag(right_rail.ItemIsMovable, False)
-
-        # Rungs horizontales
-        pen_rung = QPen(QColor("#888888"))
-        pen_rung.setWidth(1)
+        # Rieles izquierdo y derecho en un único path
+        rails = QPainterPath()
+        rails.moveTo(self.rail_x_left, top_y)
+        rails.lineTo(self.rail_x_left, bottom_y)
+        rails.moveTo(self.rail_x_right, top_y)
+        rails.lineTo(self.rail_x_right, bottom_y)
 
+        # Rungs horizontales (otro path: usan un pen distinto)
+        rungs = QPainterPath()
         for r in range(self.num_rows):
             cy = self.base_y + r * self.row_height
-            rung = scene.addLine(
-                self.rail_x_left, cy,
-                self.rail_x_right, cy,
-                pen_rung
-            )
-            rung.setZValue(-10)
-            rung.setFlag(rung.ItemIsSelectable, False)
-            rung.setFlag(rung.ItemIsMovable, False)
+            rungs.moveTo(self.rail_x_left, cy)
+            rungs.lineTo(self.rail_x_right, cy)
+
+        # No se agregan a la escena: se pintan en drawBackground (fondo cacheado)
+        self._rails_path = rails
+        self._rungs_path = rungs
 
         # Rectángulo de escena para el fitInView
         margin = 40
@@ -152,68 +335,86 @@ class WorkspaceView(QGraphicsView):
             (bottom_y - top_y) + 2 * margin
         )
 
+    def drawBackground(self, painter: QPainter, rect: QRectF):
+        super().drawBackground(painter, rect)
+        painter.setBrush(Qt.NoBrush)
+        painter.setPen(_PEN_RAIL)
+        painter.drawPath(self._rails_path)
+        painter.setPen(_PEN_RUNG)
+        painter.drawPath(self._rungs_path)
+
     # ------------------------------------------------------------------
     # Zoom automático al contenido
     # ------------------------------------------------------------------
     def _fit_to_view(self):
-        rect = self.scene().sceneRect()
-        if not rect.isNull():
-            self.fitInView(rect, Qt.KeepAspectRatio)
+        rect = self._scene.sceneRect()
+        if rect.isNull():
+            return
+        # El encuadre depende del rect de escena y del tamaño del viewport
+        fit_key = (rect, self.viewport().size())
+        if fit_key == self._last_fit:
+            return
+        self.fitInView(rect, Qt.KeepAspectRatio)
+        self._last_fit = fit_key
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        self._fit_to_view()
+        if event.size() == self._last_size:
+            return
+        self._last_size = event.size()
+        # Una ráfaga de resizes termina en un solo fitInView
+        self._resize_timer.start()
 
     # ------------------------------------------------------------------
     # Utilidades de grilla
     # ------------------------------------------------------------------
     def row_from_y(self, y: float) -> int:
-        r = round((y - self.base_y) / self.row_height)
-        r = max(0, min(self.num_rows - 1, r))
-        return r
+        # Redondeo al renglón más cercano; los negativos truncan a 0 y el clamp los cubre
+        r = int((y - self.base_y) * self._inv_row_height + 0.5)
+        return 0 if r < 0 else (self.num_rows - 1 if r >= self.num_rows else r)
 
     def col_from_x(self, x: float) -> int:
-        rel = (x - self.base_x) / self.col_width
-        c = round(rel)
-        if c < 0:
-            c = 0
-        if c >= self.max_cols:
-            c = self.max_cols - 1
-        return c
+        c = int((x - self.base_x) * self._inv_col_width + 0.5)
+        return 0 if c < 0 else (self.max_cols - 1 if c >= self.max_cols else c)
 
     def grid_center(self, row: int, col: int) -> QPointF:
-        cx = self.base_x + col * self.col_width
-        cy = self.base_y + row * self.row_height
-        return QPointF(cx, cy)
+        return QPointF(self._col_centers[col], self._row_centers[row])
 
     def set_block_center(self, item, center: QPointF):
-        br = item.boundingRect()
-        x = center.x() - (br.width() / 2 + br.x())
-        y = center.y() - (br.height() / 2 + br.y())
-        item.setPos(x, y)
+        # Todos los bloques miden BLOCK_WIDTH x BLOCK_HEIGHT con origen en (0, 0)
+        item.setPos(center.x() - _BLOCK_W_HALF, center.y() - _BLOCK_H_HALF)
 
     # ------------------------------------------------------------------
     # Drag & Drop desde los botones
     # ------------------------------------------------------------------
     def dragEnterEvent(self, event):
-        if event.mimeData().hasFormat(MIME_BLOCK_TYPE):
+        # El formato no cambia durante el drag: se consulta una sola vez
+        self._drag_accepted = event.mimeData().hasFormat(MIME_BLOCK_TYPE)
+        if self._drag_accepted:
             event.acceptProposedAction()
         else:
             event.ignore()
 
     def dragMoveEvent(self, event):
-        if event.mimeData().hasFormat(MIME_BLOCK_TYPE):
+        if self._drag_accepted:
             event.acceptProposedAction()
         else:
             event.ignore()
 
+    def dragLeaveEvent(self, event):
+        self._drag_accepted = False
+        super().dragLeaveEvent(event)
+
     def dropEvent(self, event):
         if not event.mimeData().hasFormat(MIME_BLOCK_TYPE):
             event.ignore()
             return
 
-        block_type_bytes = event.mimeData().data(MIME_BLOCK_TYPE)
-        block_type = bytes(block_type_bytes).decode("utf-8")
+        # Tipos conocidos por tabla; cualquier otro payload se decodifica sin cachear
+        raw = bytes(event.mimeData().data(MIME_BLOCK_TYPE))
+        block_type = self._BLOCK_TYPES.get(raw)
+        if block_type is None:
+            block_type = raw.decode("utf-8", errors="replace")
 
         pos_in_scene = self.mapToScene(event.pos())
         row = self.row_from_y(pos_in_scene.y())
@@ -228,14 +429,16 @@ class WorkspaceView(QGraphicsView):
 
         # Crear gráficamente el bloque
         item = self._create_graphics_block(block_type)
-        item.setData(0, "BLOCK")
-        item.setData(1, state.id)  # ID de sesión
+        # ID de sesión como atributo Python (sin pasar por QVariant en cada lectura);
+        # items_by_id mantiene vivo el wrapper, así que el atributo se conserva
+        item._plc_block_id = state.id
         item.setZValue(0)
 
         self.items_by_id[state.id] = item
 
         # Reposicionar toda la fila
-        self.layout_row(row)
+        self._dirty_rows.add(row)
+        self._flush_layout()
 
         event.acceptProposedAction()
 
@@ -243,175 +446,130 @@ class WorkspaceView(QGraphicsView):
     # Crear bloque gráfico segun tipo (símbolos ladder)
     # ------------------------------------------------------------------
     def _create_graphics_block(self, block_type: str):
-        if block_type == "XIC":
-            return self._create_contact_no_block()
-        elif block_type == "XIO":
-            return self._create_contact_nc_block()
-        elif block_type in ("OTE", "OTL", "OTU"):
-            return self._create_coil_block(block_type)
-        elif block_type == "TON":
-            return self._create_timer_block()
-        else:
-            return self._create_contact_no_block()
-
-    # --- Constructores de símbolos ladder (gráficos) ---
-    def _create_contact_no_block(self):
-        scene = self.scene()
-        width = 120
-        height = 50
-
-        rect = scene.addRect(
-            0, 0, width, height,
-            QPen(QColor("#ffffff")),
-            QBrush(QColor("#2d2d30"))
-        )
-        rect.setFlag(rect.ItemIsMovable, True)
-        rect.setFlag(rect.ItemIsSelectable, True)
-
-        # Líneas del contacto
-        pen = QPen(QColor("#ffffff"))
-        pen.setWidth(2)
-        cx = width / 2
-        y1 = height * 0.2
-        y2 = height * 0.8
-        offset = 20
-
-        left_line = scene.addLine(cx - offset, y1, cx - offset, y2, pen)
-        right_line = scene.addLine(cx + offset, y1, cx + offset, y2, pen)
-
-        left_line.setParentItem(rect)
-        right_line.setParentItem(rect)
-
-        return rect
-
-    def _create_contact_nc_block(self):
-        rect = self._create_contact_no_block()
-        scene = self.scene()
-        br = rect.boundingRect()
-        width = br.width()
-        height = br.height()
-
-        pen = QPen(QColor("#ffffff"))
-        pen.setWidth(2)
-        cx = width / 2
-        y1 = height * 0.2
-        y2 = height * 0.8
-        offset = 20
-
-        diag = scene.addLine(
-            cx - offset, y1,
-            cx + offset, y2,
-            pen
-        )
-        diag.setParentItem(rect)
+        prototype = self._prototypes.get(block_type)
+        if prototype is None:
+            prototype = self._prototypes["XIC"]
+
+        # Un solo item por bloque: sin hijos ni texto que recorrer al pintar
+        item = _BlockItem(prototype)
+        item.setFlag(QGraphicsItem.ItemIsMovable, True)
+        item.setFlag(QGraphicsItem.ItemIsSelectable, True)
+        # Nadie escucha cambios de posición en escena: no generarlos en cada setPos
+        item.setFlag(QGraphicsItem.ItemSendsScenePositionChanges, False)
+        item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self._scene.addItem(item)
+        return item
 
-        return rect
+    # ------------------------------------------------------------------
+    # Símbolos pre-grabados (un QPicture por tipo de bloque)
+    # ------------------------------------------------------------------
+    def _prerender_symbols(self):
+        for block_type in BLOCK_TYPES:
+            if block_type not in self._prototypes:
+                self._prototypes[block_type] = self._render_symbol(block_type)
 
-    def _create_coil_block(self, coil_type="OTE"):
-        scene = self.scene()
-        width = 120
-        height = 50
+    def _render_symbol(self, block_type: str) -> QPicture:
+        # QPicture guarda los comandos de dibujo: se reproduce nítido a cualquier zoom
+        picture = QPicture()
 
-        rect = scene.addRect(
-            0, 0, width, height,
-            QPen(QColor("#ffffff")),
-            QBrush(QColor("#2d2d30"))
-        )
-        rect.setFlag(rect.ItemIsMovable, True)
-        rect.setFlag(rect.ItemIsSelectable, True)
-
-        radius = 14
-        cx = width / 2
-        cy = height / 2
-        circ = scene.addEllipse(
-            cx - radius, cy - radius,
-            2 * radius, 2 * radius,
-            QPen(QColor("#ffffff")),
-            QBrush(Qt.NoBrush)
-        )
-        circ.setParentItem(rect)
-
-        inner_text = self.scene().addText(coil_type, QFont("Segoe UI", 7, QFont.Bold))
-        inner_text.setDefaultTextColor(QColor("#ffffff"))
-        tr = inner_text.boundingRect()
-        inner_text.setPos(
-            cx - tr.width() / 2,
-            cy - tr.height() / 2
-        )
-        inner_text.setParentItem(rect)
+        painter = QPainter(picture)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        paint = self._symbol_painters.get(block_type, self._paint_contact)
+        paint(painter)
+        painter.end()
 
-        return rect
+        return picture
 
-    def _create_timer_block(self):
-        scene = self.scene()
-        width = 120
-        height = 50
+    # --- Dibujo de símbolos ladder (sobre el QPainter del prototipo) ---
+    def _paint_frame(self, painter: QPainter):
+        # Medio pixel hacia adentro para que el borde de 1px no salga del boundingRect
+        painter.setPen(_PEN_WHITE)
+        painter.setBrush(_BRUSH_BLOCK)
+        painter.drawRect(QRectF(0.5, 0.5, BLOCK_WIDTH - 1, BLOCK_HEIGHT - 1))
 
-        rect = scene.addRect(
-            0, 0, width, height,
-            QPen(QColor("#ffffff")),
-            QBrush(QColor("#2d2d30"))
-        )
-        rect.setFlag(rect.ItemIsMovable, True)
-        rect.setFlag(rect.ItemIsSelectable, True)
-
-        margin = 10
-        inner = scene.addRect(
-            margin, margin,
-            width - 2 * margin, height - 2 * margin,
-            QPen(QColor("#ffffff")),
-            QBrush(Qt.NoBrush)
-        )
-        inner.setParentItem(rect)
-
-        inner_text = scene.addText("TON", QFont("Segoe UI", 9, QFont.Bold))
-        inner_text.setDefaultTextColor(QColor("#ffffff"))
-        br = rect.boundingRect()
-        tr = inner_text.boundingRect()
-        inner_text.setPos(
-            br.center().x() - tr.width() / 2,
-            br.center().y() - tr.height() / 2
-        )
-        inner_text.setParentItem(rect)
+    def _paint_label(self, painter: QPainter, text: str, font: QFont):
+        # El texto queda grabado en el prototipo: sin items de texto por bloque
+        painter.setFont(font)
+        painter.setPen(_COLOR_WHITE)
+        painter.drawText(QRectF(0, 0, BLOCK_WIDTH, BLOCK_HEIGHT), Qt.AlignCenter, text)
 
-        return rect
+    def _paint_contact(self, painter: QPainter, normally_closed: bool = False):
+        self._paint_frame(painter)
+
+        painter.setPen(_PEN_WHITE_2)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(_PATH_XIO if normally_closed else _PATH_XIC)
+
+    def _paint_coil(self, painter: QPainter, coil_type="OTE"):
+        self._paint_frame(painter)
+
+        painter.setPen(_PEN_WHITE)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(_PATH_COIL)
+
+        self._paint_label(painter, coil_type, _FONT_COIL)
+
+    def _paint_timer(self, painter: QPainter):
+        self._paint_frame(painter)
+
+        painter.setPen(_PEN_WHITE)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(_PATH_TON)
+
+        self._paint_label(painter, "TON", _FONT_TIMER)
 
     # ------------------------------------------------------------------
     # Layout de filas en función de la sesión (grid[row][col])
     # ------------------------------------------------------------------
+    def _flush_layout(self):
+        """Reacomoda (una vez cada una) las filas marcadas como sucias."""
+        for row in self._dirty_rows:
+            self.layout_row(row)
+        self._dirty_rows.clear()
+
     def layout_row(self, row: int):
         if not (0 <= row < self.num_rows):
             return
 
-        for col in range(self.max_cols):
-            block_id = self.session.grid[row][col]
+        items = self.items_by_id
+        col_centers = self._col_centers
+        y = self._row_centers[row] - _BLOCK_H_HALF
+
+        # Primero se calculan los destinos, después se escriben todas las posiciones juntas
+        targets = []
+        for col, block_id in enumerate(self.session.grid[row]):
             if block_id is None:
                 continue
-            item = self.items_by_id.get(block_id)
+            item = items.get(block_id)
             if item is None:
                 continue
-            center = self.grid_center(row, col)
-            self.set_block_center(item, center)
+            targets.append((item, col_centers[col] - _BLOCK_W_HALF))
+
+        for item, x in targets:
+            item.setPos(x, y)
 
     # ------------------------------------------------------------------
     # Reordenamiento al soltar el mouse
     # ------------------------------------------------------------------
+    def mousePressEvent(self, event):
+        # El bloque que se arrastra se identifica una sola vez, al presionar
+        item = self.itemAt(event.pos())
+        self._drag_block = self._get_block_from_item(item) if item is not None else None
+        super().mousePressEvent(event)
+
     def mouseReleaseEvent(self, event):
         super().mouseReleaseEvent(event)
 
-        item = self.itemAt(event.pos())
-        if item is None:
-            return
-
-        block_item = self._get_block_from_item(item)
+        block_item = self._drag_block
+        self._drag_block = None
+        if block_item is None:
+            # Sin press registrado (p. ej. evento sintetizado): hit-test como antes
+            item = self.itemAt(event.pos())
+            block_item = self._get_block_from_item(item) if item is not None else None
         if block_item is None:
             return
 
-        block_id = block_item.data(1)
-        if block_id is None:
-            return
-
-        block_id = int(block_id)
+        block_id = block_item._plc_block_id
 
         # Centro del bloque en escena
         center_scene = block_item.mapToScene(block_item.boundingRect().center())
@@ -435,39 +593,31 @@ class WorkspaceView(QGraphicsView):
             return
 
         (old_row, old_col), (final_row, final_col) = moved
-        self.layout_row(old_row)
-        if final_row != old_row:
-            self.layout_row(final_row)
-        else:
-            self.layout_row(final_row)
+        self._dirty_rows.add(old_row)
+        self._dirty_rows.add(final_row)
+        self._flush_layout()
 
     def _get_block_from_item(self, item):
-        it = item
-        while it is not None:
-            if it.data(0) == "BLOCK":
-                return it
-            it = it.parentItem()
-        return None
+        # Los bloques son items de primer nivel: no hace falta recorrer parentItem()
+        top = item.topLevelItem()
+        return top if hasattr(top, "_plc_block_id") else None
 
     # ------------------------------------------------------------------
     # Borrado de bloques
     # ------------------------------------------------------------------
     def delete_block(self, block_item):
-        block_id = block_item.data(1)
-        if block_id is None:
-            return
-
-        block_id = int(block_id)
+        block_id = block_item._plc_block_id
         pos = self.session.delete_block(block_id)
-        self.scene().removeItem(block_item)
+        self._scene.removeItem(block_item)
         self.items_by_id.pop(block_id, None)
 
         if pos is not None:
             row, _ = pos
-            self.layout_row(row)
+            self._dirty_rows.add(row)
+            self._flush_layout()
 
     def delete_selected(self):
-        selected = self.scene().selectedItems()
+        selected = self._scene.selectedItems()
         processed = set()
         for item in selected:
             block = self._get_block_from_item(item)
@@ -550,18 +700,18 @@ class MainWindow(QMainWindow):
 
     def on_print_clicked(self):
         """Imprime en consola la estructura del grid con el tipo de elemento."""
+        types = self.session.block_types
+        grid = self.session.grid
+        # "." = celda vacía, si no tipo(id)
+        lines = [
+            f"Fila {r}: " + "  ".join(
+                "." if bid is None else f"{types.get(bid, '?')}({bid})"
+                for bid in grid[r]
+            )
+            for r in range(self.session.max_rows)
+        ]
         print("\n=== Estructura actual del grid ===")
-        for r in range(self.session.max_rows):
-            fila_repr = []
-            for c in range(self.session.max_cols):
-                block_id = self.session.grid[r][c]
-                if block_id is None:
-                    fila_repr.append(".")  # celda vacía
-                else:
-                    btype = self.session.block_types.get(block_id, "?")
-                    # Puedes elegir: sólo tipo, o tipo+id
-                    fila_repr.append(f"{btype}({block_id})")
-            print(f"Fila {r}: " + "  ".join(fila_repr))
+        print("\n".join(lines))
         print("===================================\n")
 
 
@@ -2,10 +2,13 @@ import sys
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget,
     QHBoxLayout, QVBoxLayout, QPushButton,
-    QLabel, QGraphicsView, QGraphicsScene
+    QLabel, QGraphicsView, QGraphicsScene, QGraphicsItem, QOpenGLWidget,
+    QGraphicsSimpleTextItem
 )
 from PyQt5.QtCore import Qt, QMimeData, QPoint, QPointF, QByteArray
-from PyQt5.QtGui import QDrag, QBrush, QPen, QFont, QColor, QPainter, QPolygonF
+from PyQt5.QtGui import (
+    QDrag, QBrush, QPen, QFont, QColor, QPainter, QPolygonF, QSurfaceFormat
+)
 
 
 MIME_BLOCK_TYPE = "application/x-plc-block"
@@ -20,6 +23,10 @@ class DraggableButton(QPushButton):
         super().__init__(text, parent)
         self.block_type = block_type
         self._drag_start_pos = None
+        # Payload MIME codificado una sola vez por botón
+        self._mime_payload = QByteArray(block_type.encode("utf-8"))
+        # Distancia mínima (al cuadrado) para considerar que es un drag
+        self._threshold2 = 10 * 10
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -30,18 +37,22 @@ class DraggableButton(QPushButton):
         if not (event.buttons() & Qt.LeftButton):
             return
 
-        if self._drag_start_pos is None:
+        start = self._drag_start_pos
+        if start is None:
             return
 
-        # Distancia mínima para considerar que es un drag
-        if (event.pos() - self._drag_start_pos).manhattanLength() < 10:
+        # Distancia mínima para considerar que es un drag (sin QPoint temporal)
+        pos = event.pos()
+        dx = pos.x() - start.x()
+        dy = pos.y() - start.y()
+        if dx * dx + dy * dy < self._threshold2:
             return
 
         # Iniciar el drag
         drag = QDrag(self)
         mime_data = QMimeData()
         # Guardamos el tipo de bloque como bytes
-        mime_data.setData(MIME_BLOCK_TYPE, QByteArray(self.block_type.encode("utf-8")))
+        mime_data.setData(MIME_BLOCK_TYPE, self._mime_payload)
         drag.setMimeData(mime_data)
 
         drag.exec_(Qt.CopyAction)
@@ -52,37 +63,112 @@ class WorkspaceView(QGraphicsView):
     Vista del espacio de trabajo. Acepta drops de bloques
     y crea formas (rectángulo, triángulo, círculo).
     """
+    # Estilos compartidos: se crean una sola vez y nunca se modifican
+    _PEN_WHITE = QPen(QColor("#ffffff"))
+    _BRUSH_FILL = QBrush(QColor("#2d2d30"))
+    _LABEL_COLOR = QColor("#ffffff")
+    _LABEL_BRUSH = QBrush(_LABEL_COLOR)
+    # Triángulo isósceles en coordenadas locales, centrado en el origen;
+    # addPolygon copia el polígono, así que todos los triángulos lo comparten
+    _TRI_SIZE = 60
+    _TRI_POLY = QPolygonF([
+        QPointF(0, -_TRI_SIZE / 2),
+        QPointF(-_TRI_SIZE / 2, _TRI_SIZE / 2),
+        QPointF(_TRI_SIZE / 2, _TRI_SIZE / 2),
+    ])
+    # La fuente necesita la QApplication ya creada (DPI): ver __init__
+    _LABEL_FONT = None
+    # Texto de etiqueta -> QSizeF ya medido con _LABEL_FONT
+    _LABEL_SIZE = {}
+    # Payload MIME -> block_type, sin decodificar bytes en cada drop
+    _BLOCK_TYPES = {b"RECT": "RECT", b"TRI": "TRI", b"CIRC": "CIRC"}
+
     def __init__(self, parent=None):
         super().__init__(parent)
+
+        cls = type(self)
+        if cls._LABEL_FONT is None:
+            cls._LABEL_FONT = QFont("Segoe UI", 9, QFont.Bold)
+            # Sólo hay tres etiquetas y una fuente: se miden una vez
+            for text in ("Rectángulo", "Triángulo", "Círculo"):
+                probe = QGraphicsSimpleTextItem(text)
+                probe.setFont(cls._LABEL_FONT)
+                cls._LABEL_SIZE[text] = probe.boundingRect().size()
+
+        # Relleno de los polígonos en la GPU; el antialiasing lo da el
+        # multisampling (4 muestras) del framebuffer del viewport
+        fmt = QSurfaceFormat()
+        fmt.setSamples(4)
+        gl = QOpenGLWidget()
+        gl.setFormat(fmt)
+        self.setViewport(gl)
+        # QOpenGLWidget no soporta actualizaciones parciales del viewport
+        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # Muchos items chicos que no tocan el estado del painter ni se salen
+        # de su boundingRect: ahorrar save/restore y el margen de antialiasing
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
+        self.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing, True)
+
         scene = QGraphicsScene(self)
+        # Pocas formas: mantener un índice BSP cuesta más que recorrerlas
+        scene.setItemIndexMethod(QGraphicsScene.NoIndex)
         self.setScene(scene)
 
         self.setRenderHint(QPainter.Antialiasing, True)
         self.setAcceptDrops(True)
+        # Resultado de hasFormat cacheado en dragEnterEvent para todo el drag
+        self._drag_accepted = False
 
         self.setBackgroundBrush(QColor("#1e1e1e"))
-        self.setDragMode(QGraphicsView.RubberBandDrag)
+
+        # block_type -> constructor de la forma
+        self._block_factories = {
+            "RECT": self.create_rectangle_block,
+            "TRI": self.create_triangle_block,
+            "CIRC": self.create_circle_block,
+        }
+
+        # Sin rubber band por defecto (ver mousePressEvent); cuando se usa,
+        # la selección se calcula contra bounding rects, no contra formas
+        self.setRubberBandSelectionMode(Qt.IntersectsItemBoundingRect)
+
+    # -------- Selección por rectángulo --------
+    def mousePressEvent(self, event):
+        """La selección por rectángulo sólo se activa con Shift apretado."""
+        if event.modifiers() & Qt.ShiftModifier:
+            self.setDragMode(QGraphicsView.RubberBandDrag)
+        else:
+            self.setDragMode(QGraphicsView.NoDrag)
+        super().mousePressEvent(event)
 
     # -------- Drag & Drop desde los botones --------
     def dragEnterEvent(self, event):
-        if event.mimeData().hasFormat(MIME_BLOCK_TYPE):
+        # El formato no cambia durante el drag: se consulta una sola vez
+        self._drag_accepted = event.mimeData().hasFormat(MIME_BLOCK_TYPE)
+        if self._drag_accepted:
             event.acceptProposedAction()
         else:
             event.ignore()
 
     def dragMoveEvent(self, event):
-        if event.mimeData().hasFormat(MIME_BLOCK_TYPE):
+        if self._drag_accepted:
             event.acceptProposedAction()
         else:
             event.ignore()
 
+    def dragLeaveEvent(self, event):
+        self._drag_accepted = False
+        super().dragLeaveEvent(event)
+
     def dropEvent(self, event):
-        if not event.mimeData().hasFormat(MIME_BLOCK_TYPE):
+        self._drag_accepted = False
+        mime = event.mimeData()
+        if not mime.hasFormat(MIME_BLOCK_TYPE):
             event.ignore()
             return
 
-        block_type_bytes = event.mimeData().data(MIME_BLOCK_TYPE)
-        block_type = bytes(block_type_bytes).decode("utf-8")
+        # Un tipo desconocido queda en None y create_block dibuja un rectángulo
+        block_type = self._BLOCK_TYPES.get(bytes(mime.data(MIME_BLOCK_TYPE)))
 
         # Coordenadas del drop en la escena
         pos_in_view = event.pos()
@@ -97,15 +183,9 @@ class WorkspaceView(QGraphicsView):
         Según el tipo de bloque, crea la forma correspondiente.
         block_type puede ser: "RECT", "TRI", "CIRC".
         """
-        if block_type == "RECT":
-            self.create_rectangle_block(pos)
-        elif block_type == "TRI":
-            self.create_triangle_block(pos)
-        elif block_type == "CIRC":
-            self.create_circle_block(pos)
-        else:
-            # Por si en algún momento llega algo inesperado
-            self.create_rectangle_block(pos)
+        # Por si en algún momento llega algo inesperado: rectángulo
+        factory = self._block_factories.get(block_type, self.create_rectangle_block)
+        factory(pos)
 
     # -------- Formas individuales --------
     def create_rectangle_block(self, pos: QPointF):
@@ -117,50 +197,52 @@ class WorkspaceView(QGraphicsView):
 
         rect_item = scene.addRect(
             x, y, width, height,
-            QPen(QColor("#ffffff")),
-            QBrush(QColor("#2d2d30"))
+            self._PEN_WHITE,
+            self._BRUSH_FILL
         )
         rect_item.setFlag(rect_item.ItemIsMovable, True)
         rect_item.setFlag(rect_item.ItemIsSelectable, True)
+        # Forma estática: se rasteriza una vez y luego sólo se copia el pixmap
+        rect_item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
         # Etiqueta de texto dentro del rectángulo
-        text_item = scene.addText("Rectángulo", QFont("Segoe UI", 9, QFont.Bold))
-        text_item.setDefaultTextColor(QColor("#ffffff"))
-        text_rect = text_item.boundingRect()
+        text_item = QGraphicsSimpleTextItem("Rectángulo", rect_item)
+        text_item.setFont(self._LABEL_FONT)
+        text_item.setBrush(self._LABEL_BRUSH)
+        text_item.setCacheMode(QGraphicsItem.ItemCoordinateCache)
+        text_size = self._LABEL_SIZE["Rectángulo"]
         text_item.setPos(
-            x + (width - text_rect.width()) / 2,
-            y + (height - text_rect.height()) / 2
+            x + (width - text_size.width()) / 2,
+            y + (height - text_size.height()) / 2
         )
-        text_item.setParentItem(rect_item)
 
     def create_triangle_block(self, pos: QPointF):
         scene = self.scene()
 
-        # Triángulo isósceles centrado en pos
-        size = 60
-        p_top = QPointF(pos.x(), pos.y() - size / 2)
-        p_left = QPointF(pos.x() - size / 2, pos.y() + size / 2)
-        p_right = QPointF(pos.x() + size / 2, pos.y() + size / 2)
-
-        polygon = QPolygonF([p_top, p_left, p_right])
-
+        # Triángulo compartido, centrado en pos moviendo el item
+        size = self._TRI_SIZE
         tri_item = scene.addPolygon(
-            polygon,
-            QPen(QColor("#ffffff")),
-            QBrush(QColor("#2d2d30"))
+            self._TRI_POLY,
+            self._PEN_WHITE,
+            self._BRUSH_FILL
         )
+        tri_item.setPos(pos)
         tri_item.setFlag(tri_item.ItemIsMovable, True)
         tri_item.setFlag(tri_item.ItemIsSelectable, True)
+        # Forma estática: se rasteriza una vez y luego sólo se copia el pixmap
+        tri_item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
         # Texto debajo del triángulo
-        text_item = scene.addText("Triángulo", QFont("Segoe UI", 9, QFont.Bold))
-        text_item.setDefaultTextColor(QColor("#ffffff"))
-        text_rect = text_item.boundingRect()
+        text_item = QGraphicsSimpleTextItem("Triángulo", tri_item)
+        text_item.setFont(self._LABEL_FONT)
+        text_item.setBrush(self._LABEL_BRUSH)
+        text_item.setCacheMode(QGraphicsItem.ItemCoordinateCache)
+        text_size = self._LABEL_SIZE["Triángulo"]
+        # Coordenadas relativas al triángulo (el texto es hijo del item)
         text_item.setPos(
-            pos.x() - text_rect.width() / 2,
-            pos.y() + size / 2 + 4  # un poquito por debajo
+            -text_size.width() / 2,
+            size / 2 + 4  # un poquito por debajo
         )
-        text_item.setParentItem(tri_item)
 
     def create_circle_block(self, pos: QPointF):
         scene = self.scene()
@@ -170,21 +252,24 @@ class WorkspaceView(QGraphicsView):
 
         circ_item = scene.addEllipse(
             x, y, 2 * radius, 2 * radius,
-            QPen(QColor("#ffffff")),
-            QBrush(QColor("#2d2d30"))
+            self._PEN_WHITE,
+            self._BRUSH_FILL
         )
         circ_item.setFlag(circ_item.ItemIsMovable, True)
         circ_item.setFlag(circ_item.ItemIsSelectable, True)
+        # Forma estática: se rasteriza una vez y luego sólo se copia el pixmap
+        circ_item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
         # Etiqueta de texto en el centro
-        text_item = scene.addText("Círculo", QFont("Segoe UI", 9, QFont.Bold))
-        text_item.setDefaultTextColor(QColor("#ffffff"))
-        text_rect = text_item.boundingRect()
+        text_item = QGraphicsSimpleTextItem("Círculo", circ_item)
+        text_item.setFont(self._LABEL_FONT)
+        text_item.setBrush(self._LABEL_BRUSH)
+        text_item.setCacheMode(QGraphicsItem.ItemCoordinateCache)
+        text_size = self._LABEL_SIZE["Círculo"]
         text_item.setPos(
-            pos.x() - text_rect.width() / 2,
-            pos.y() - text_rect.height() / 2
+            pos.x() - text_size.width() / 2,
+            pos.y() - text_size.height() / 2
         )
-        text_item.setParentItem(circ_item)
 
 
 class MainWindow(QMainWindow):
@@ -2,9 +2,10 @@ import sys
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget,
     QHBoxLayout, QVBoxLayout, QPushButton,
-    QLabel, QGraphicsView, QGraphicsScene
+    QLabel, QGraphicsView, QGraphicsScene, QGraphicsItem,
+    QGraphicsRectItem, QGraphicsLineItem, QGraphicsEllipseItem, QGraphicsSimpleTextItem
 )
-from PyQt5.QtCore import Qt, QMimeData, QPointF, QByteArray
+from PyQt5.QtCore import Qt, QMimeData, QPointF, QByteArray, QTimer
 from PyQt5.QtGui import (
     QDrag, QBrush, QPen, QFont, QColor,
     QPainter, QPolygonF
@@ -23,6 +24,10 @@ class DraggableButton(QPushButton):
         super().__init__(text, parent)
         self.block_type = block_type
         self._drag_start_pos = None
+        # Payload MIME codificado una sola vez por botón
+        self._mime_payload = QByteArray(block_type.encode("utf-8"))
+        # Distancia mínima (al cuadrado) para considerar que es un drag
+        self._threshold2 = 10 * 10
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -33,17 +38,21 @@ class DraggableButton(QPushButton):
         if not (event.buttons() & Qt.LeftButton):
             return
 
-        if self._drag_start_pos is None:
+        start = self._drag_start_pos
+        if start is None:
             return
 
-        # Distancia mínima para considerar que es un drag
-        if (event.pos() - self._drag_start_pos).manhattanLength() < 10:
+        # Distancia mínima para considerar que es un drag (sin QPoint temporal)
+        pos = event.pos()
+        dx = pos.x() - start.x()
+        dy = pos.y() - start.y()
+        if dx * dx + dy * dy < self._threshold2:
             return
 
         # Iniciar el drag
         drag = QDrag(self)
         mime_data = QMimeData()
-        mime_data.setData(MIME_BLOCK_TYPE, QByteArray(self.block_type.encode("utf-8")))
+        mime_data.setData(MIME_BLOCK_TYPE, self._mime_payload)
         drag.setMimeData(mime_data)
 
         drag.exec_(Qt.CopyAction)
@@ -58,14 +67,43 @@ class WorkspaceView(QGraphicsView):
     - Reordenamiento arrastrando bloques.
     - Borrado de bloques seleccionados (botón o tecla Delete/Backspace).
     """
+    # Estilos compartidos: se crean una sola vez y nunca se modifican
+    _PEN_WHITE = QPen(QColor("#ffffff"))
+    _PEN_WHITE_2 = QPen(QColor("#ffffff"), 2)
+    _BRUSH_FILL = QBrush(QColor("#2d2d30"))
+    _BRUSH_NONE = QBrush(Qt.NoBrush)
+    _PEN_RAIL = QPen(QColor("#bbbbbb"), 2)
+    _PEN_RUNG = QPen(QColor("#888888"), 1)
+    _LABEL_COLOR = QColor("#ffffff")
+    _LABEL_BRUSH = QBrush(_LABEL_COLOR)
+    # Las fuentes necesitan la QApplication ya creada (DPI): ver __init__
+    _LABEL_FONT = None
+    _COIL_FONT = None
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
+        cls = type(self)
+        if cls._LABEL_FONT is None:
+            cls._LABEL_FONT = QFont("Segoe UI", 9, QFont.Bold)
+            cls._COIL_FONT = QFont("Segoe UI", 7, QFont.Bold)
+
         scene = QGraphicsScene(self)
+        # Pocos items por escena y layout_row los mueve a todos: sin índice BSP
+        # que reconstruir en cada setPos (itemAt pasa a ser un recorrido lineal)
+        scene.setItemIndexMethod(QGraphicsScene.NoIndex)
         self.setScene(scene)
 
         self.setRenderHint(QPainter.Antialiasing, True)
+        # Un solo repintado completo en vez de calcular regiones sucias por bloque
+        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # Muchos items chicos que no tocan el estado del painter ni se salen
+        # de su boundingRect: ahorrar save/restore y el margen de antialiasing
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
+        self.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing, True)
         self.setAcceptDrops(True)
+        # Resultado de hasFormat cacheado en dragEnterEvent para todo el drag
+        self._drag_accepted = False
         self.setBackgroundBrush(QColor("#1e1e1e"))
         self.setFocusPolicy(Qt.ClickFocus)  # para recibir teclas al hacer click
 
@@ -78,9 +116,36 @@ class WorkspaceView(QGraphicsView):
         self.col_width = 140    # distancia entre columnas
         self.max_cols = 6       # MÁXIMO número de columnas visibles por fila
 
+        # Centros de cada slot precalculados: _centers[row][index] (no modificar)
+        self._build_centers()
+
         # Estructura lógica: lista de filas, cada fila es lista de items (bloques)
         self.rows = [[] for _ in range(self.num_rows)]
 
+        # Bloques existentes y su posición lógica (row, index), sin pasar por setData
+        self._blocks = set()
+        self._block_pos = {}
+        # Offset centro -> esquina de cada bloque (su boundingRect no cambia)
+        self._block_offset = {}
+        # Bloque bajo el cursor al presionar (el que se está arrastrando)
+        self._drag_block = None
+
+        # block_type -> constructor del símbolo ladder
+        self._block_factories = {
+            "XIC": self.create_contact_no_block,
+            "XIO": self.create_contact_nc_block,
+            "OTE": lambda: self.create_coil_block("OTE"),
+            "OTL": lambda: self.create_coil_block("OTL"),
+            "OTU": lambda: self.create_coil_block("OTU"),
+            "TON": self.create_timer_block,
+        }
+
+        # Debounce de resizeEvent -> _fit_to_view
+        self._fit_timer = QTimer(self)
+        self._fit_timer.setSingleShot(True)
+        self._fit_timer.setInterval(50)
+        self._fit_timer.timeout.connect(self._fit_to_view)
+
         # Dibujar los rieles y renglones tipo ladder
         self._create_ladder_rungs()
 
@@ -108,8 +173,7 @@ class WorkspaceView(QGraphicsView):
         top_y = self.base_y - self.row_height
         bottom_y = self.base_y + (self.num_rows) * self.row_height
 
-        pen_rail = QPen(QColor("#bbbbbb"))
-        pen_rail.setWidth(2)
+        pen_rail = self._PEN_RAIL
 
         # Riel izquierdo
         left_rail = scene.addLine(
@@ -132,8 +196,7 @@ class WorkspaceView(QGraphicsView):
         right_rail.setFlag(right_rail.ItemIsMovable, False)
 
         # Rungs horizontales (uno por fila)
-        pen_rung = QPen(QColor("#888888"))
-        pen_rung.setWidth(1)
+        pen_rung = self._PEN_RUNG
 
         for r in range(self.num_rows):
             cy = self.base_y + r * self.row_height
@@ -166,62 +229,87 @@ class WorkspaceView(QGraphicsView):
     def resizeEvent(self, event):
         """Cuando la vista cambia de tamaño, reencuadra el ladder."""
         super().resizeEvent(event)
-        self._fit_to_view()
+        # Una ráfaga de resizes termina en un solo fitInView
+        self._fit_timer.start()
 
     # ------------------------------------------------------------------
     # Utilidades de grilla
     # ------------------------------------------------------------------
     def row_from_y(self, y: float) -> int:
         """Determina el índice de fila (0..3) a partir de una coordenada Y."""
-        r = round((y - self.base_y) / self.row_height)
-        r = max(0, min(self.num_rows - 1, r))
+        # int(x + 0.5) en vez de round(): sin redondeo bancario ni llamadas extra
+        r = int((y - self.base_y) / self.row_height + 0.5)
+        if r < 0:
+            return 0
+        if r >= self.num_rows:
+            return self.num_rows - 1
         return r
 
+    def _build_centers(self):
+        """(Re)calcula la tabla de centros a partir de la geometría de la grilla."""
+        self._centers = [
+            [
+                QPointF(self.base_x + c * self.col_width, self.base_y + r * self.row_height)
+                for c in range(self.max_cols)
+            ]
+            for r in range(self.num_rows)
+        ]
+
     def grid_center(self, row: int, index: int) -> QPointF:
         """Devuelve el punto centro (cx, cy) de un slot (row, index)."""
-        cx = self.base_x + index * self.col_width
-        cy = self.base_y + row * self.row_height
-        return QPointF(cx, cy)
+        return self._centers[row][index]
+
+    def _center_offset(self, item):
+        """Offset (ox, oy) entre el origen del item y el centro de su boundingRect."""
+        br = item.boundingRect()
+        return br.width() / 2 + br.x(), br.height() / 2 + br.y()
 
     def set_block_center(self, item, center: QPointF):
         """Posiciona un item para que su centro quede en 'center'."""
-        br = item.boundingRect()
-        x = center.x() - (br.width() / 2 + br.x())
-        y = center.y() - (br.height() / 2 + br.y())
-        item.setPos(x, y)
+        offset = self._block_offset.get(item)
+        if offset is None:
+            offset = self._center_offset(item)
+        item.setPos(center.x() - offset[0], center.y() - offset[1])
 
     # ------------------------------------------------------------------
     # Drag & Drop desde los botones
     # ------------------------------------------------------------------
     def dragEnterEvent(self, event):
-        if event.mimeData().hasFormat(MIME_BLOCK_TYPE):
+        # El formato no cambia durante el drag: se consulta una sola vez
+        self._drag_accepted = event.mimeData().hasFormat(MIME_BLOCK_TYPE)
+        if self._drag_accepted:
             event.acceptProposedAction()
         else:
             event.ignore()
 
     def dragMoveEvent(self, event):
-        if event.mimeData().hasFormat(MIME_BLOCK_TYPE):
+        if self._drag_accepted:
             event.acceptProposedAction()
         else:
             event.ignore()
 
+    def dragLeaveEvent(self, event):
+        self._drag_accepted = False
+        super().dragLeaveEvent(event)
+
     def dropEvent(self, event):
-        if not event.mimeData().hasFormat(MIME_BLOCK_TYPE):
+        self._drag_accepted = False
+        mime = event.mimeData()
+        if not mime.hasFormat(MIME_BLOCK_TYPE):
             event.ignore()
             return
 
-        block_type_bytes = event.mimeData().data(MIME_BLOCK_TYPE)
-        block_type = bytes(block_type_bytes).decode("utf-8")
+        block_type = bytes(mime.data(MIME_BLOCK_TYPE)).decode("utf-8")
 
         pos_in_scene = self.mapToScene(event.pos())
         row = self.row_from_y(pos_in_scene.y())
 
         # Límite de columnas: no permitir más de max_cols
-        if len(self.rows[row]) >= self.max_cols:
+        index = len(self.rows[row])  # se agrega al final de la fila
+        if index >= self.max_cols:
             event.ignore()
             return
 
-        index = len(self.rows[row])  # se agrega al final de la fila
         self.create_block(row, index, block_type)
         event.acceptProposedAction()
 
@@ -237,40 +325,27 @@ class WorkspaceView(QGraphicsView):
         - "OTL": bobina latch (SET)
         - "OTU": bobina unlatch (RESET)
         - "TON": timer ON delay
+        Un tipo desconocido se dibuja como contacto NO.
         """
-        if block_type == "XIC":
-            item = self.create_contact_no_block()
-            label_text = "XIC"
-        elif block_type == "XIO":
-            item = self.create_contact_nc_block()
-            label_text = "XIO"
-        elif block_type == "OTE":
-            item = self.create_coil_block("OTE")
-            label_text = "OTE"
-        elif block_type == "OTL":
-            item = self.create_coil_block("OTL")
-            label_text = "OTL"
-        elif block_type == "OTU":
-            item = self.create_coil_block("OTU")
-            label_text = "OTU"
-        elif block_type == "TON":
-            item = self.create_timer_block()
-            label_text = "TON"
-        else:
-            item = self.create_contact_no_block()
-            label_text = "BLK"
+        factory = self._block_factories.get(block_type, self.create_contact_no_block)
+        item = factory()
 
         # Marcar el item como "bloque" y guardar su posición lógica
-        item.setData(0, "BLOCK")
-        item.setData(1, row)
-        item.setData(2, index)
+        self._blocks.add(item)
+        self._block_pos[item] = (row, index)
+        self._block_offset[item] = self._center_offset(item)
         item.setZValue(0)
 
         # Insertar en la estructura de filas
-        self.rows[row].insert(index, item)
+        row_list = self.rows[row]
+        row_list.insert(index, item)
 
-        # Reacomodar la fila completa
-        self.layout_row(row)
+        if index == len(row_list) - 1:
+            # Agregado al final (caso del drop): ningún otro bloque se mueve
+            self.set_block_center(item, self.grid_center(row, index))
+        else:
+            # Reacomodar la fila completa
+            self.layout_row(row)
 
     # --- Constructores de símbolos ladder ---
     def create_contact_no_block(self):
@@ -284,25 +359,26 @@ class WorkspaceView(QGraphicsView):
 
         rect = scene.addRect(
             0, 0, width, height,
-            QPen(QColor("#ffffff")),
-            QBrush(QColor("#2d2d30"))
+            self._PEN_WHITE,
+            self._BRUSH_FILL
         )
         rect.setFlag(rect.ItemIsMovable, True)
         rect.setFlag(rect.ItemIsSelectable, True)
+        # Símbolo estático: se rasteriza una vez y luego sólo se copia el pixmap
+        rect.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
         # Líneas del contacto
-        pen = QPen(QColor("#ffffff"))
-        pen.setWidth(2)
+        pen = self._PEN_WHITE_2
         cx = width / 2
         y1 = height * 0.2
         y2 = height * 0.8
         offset = 20
 
-        left_line = scene.addLine(cx - offset, y1, cx - offset, y2, pen)
-        right_line = scene.addLine(cx + offset, y1, cx + offset, y2, pen)
-
-        left_line.setParentItem(rect)
-        right_line.setParentItem(rect)
+        # Hijos creados directamente con su padre (sin addLine + setParentItem)
+        left_line = QGraphicsLineItem(cx - offset, y1, cx - offset, y2, rect)
+        right_line = QGraphicsLineItem(cx + offset, y1, cx + offset, y2, rect)
+        left_line.setPen(pen)
+        right_line.setPen(pen)
 
         return rect
 
@@ -312,25 +388,23 @@ class WorkspaceView(QGraphicsView):
         Igual que NO pero con una línea diagonal cruzando.
         """
         rect = self.create_contact_no_block()
-        scene = self.scene()
         br = rect.boundingRect()
         width = br.width()
         height = br.height()
 
-        pen = QPen(QColor("#ffffff"))
-        pen.setWidth(2)
+        pen = self._PEN_WHITE_2
         cx = width / 2
         y1 = height * 0.2
         y2 = height * 0.8
         offset = 20
 
         # Línea diagonal desde arriba de la izquierda hacia abajo de la derecha
-        diag = scene.addLine(
+        diag = QGraphicsLineItem(
             cx - offset, y1,
             cx + offset, y2,
-            pen
+            rect
         )
-        diag.setParentItem(rect)
+        diag.setPen(pen)
 
         return rect
 
@@ -345,33 +419,35 @@ class WorkspaceView(QGraphicsView):
 
         rect = scene.addRect(
             0, 0, width, height,
-            QPen(QColor("#ffffff")),
-            QBrush(QColor("#2d2d30"))
+            self._PEN_WHITE,
+            self._BRUSH_FILL
         )
         rect.setFlag(rect.ItemIsMovable, True)
         rect.setFlag(rect.ItemIsSelectable, True)
+        rect.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
         # Círculo central
         radius = 14
         cx = width / 2
         cy = height / 2
-        circ = scene.addEllipse(
+        circ = QGraphicsEllipseItem(
             cx - radius, cy - radius,
             2 * radius, 2 * radius,
-            QPen(QColor("#ffffff")),
-            QBrush(Qt.NoBrush)
+            rect
         )
-        circ.setParentItem(rect)
-
-        # Texto interno pequeño (OTE, OTL, OTU)
-        inner_text = scene.addText(coil_type, QFont("Segoe UI", 7, QFont.Bold))
-        inner_text.setDefaultTextColor(QColor("#ffffff"))
+        circ.setPen(self._PEN_WHITE)
+        circ.setBrush(self._BRUSH_NONE)
+
+        # Texto interno pequeño (OTE, OTL, OTU); texto simple, sin QTextDocument
+        inner_text = QGraphicsSimpleTextItem(coil_type, rect)
+        inner_text.setFont(self._COIL_FONT)
+        inner_text.setBrush(self._LABEL_BRUSH)
+        inner_text.setCacheMode(QGraphicsItem.ItemCoordinateCache)
         tr = inner_text.boundingRect()
         inner_text.setPos(
             cx - tr.width() / 2,
             cy - tr.height() / 2
         )
-        inner_text.setParentItem(rect)
 
         return rect
 
@@ -386,32 +462,34 @@ class WorkspaceView(QGraphicsView):
 
         rect = scene.addRect(
             0, 0, width, height,
-            QPen(QColor("#ffffff")),
-            QBrush(QColor("#2d2d30"))
+            self._PEN_WHITE,
+            self._BRUSH_FILL
         )
         rect.setFlag(rect.ItemIsMovable, True)
         rect.setFlag(rect.ItemIsSelectable, True)
+        rect.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
         # Pequeño rectángulo interno tipo "módulo"
         margin = 10
-        inner = scene.addRect(
+        inner = QGraphicsRectItem(
             margin, margin,
             width - 2 * margin, height - 2 * margin,
-            QPen(QColor("#ffffff")),
-            QBrush(Qt.NoBrush)
+            rect
         )
-        inner.setParentItem(rect)
+        inner.setPen(self._PEN_WHITE)
+        inner.setBrush(self._BRUSH_NONE)
 
         # Texto TON en el centro
-        inner_text = scene.addText("TON", QFont("Segoe UI", 9, QFont.Bold))
-        inner_text.setDefaultTextColor(QColor("#ffffff"))
+        inner_text = QGraphicsSimpleTextItem("TON", rect)
+        inner_text.setFont(self._LABEL_FONT)
+        inner_text.setBrush(self._LABEL_BRUSH)
+        inner_text.setCacheMode(QGraphicsItem.ItemCoordinateCache)
         br = rect.boundingRect()
         tr = inner_text.boundingRect()
         inner_text.setPos(
             br.center().x() - tr.width() / 2,
             br.center().y() - tr.height() / 2
         )
-        inner_text.setParentItem(rect)
 
         return rect
 
@@ -419,31 +497,55 @@ class WorkspaceView(QGraphicsView):
     # Layout de filas y reordenamiento
     # ------------------------------------------------------------------
     def layout_row(self, row: int):
-        """Reposiciona todos los bloques de una fila según su índice."""
+        """
+        Reposiciona los bloques de una fila según su índice.
+        Sólo llama a setPos en los bloques que realmente cambian de lugar.
+        """
         items = self.rows[row]
+        block_pos = self._block_pos
+        block_offset = self._block_offset
+        # Centros de la fila desde la tabla (única fuente de la geometría)
+        centers = self._centers[row]
+
+        # Primero se calculan los destinos de los bloques que cambian de lugar
+        moves = []
         for i, item in enumerate(items):
-            # actualizar índice guardado en el item
-            item.setData(1, row)
-            item.setData(2, i)
-            center = self.grid_center(row, i)
-            self.set_block_center(item, center)
+            # actualizar índice guardado para el item
+            block_pos[item] = (row, i)
+            ox, oy = block_offset[item]
+            center = centers[i]
+            x = center.x() - ox
+            y = center.y() - oy
+            pos = item.pos()
+            if pos.x() != x or pos.y() != y:
+                moves.append((item, x, y))
+
+        # Después se escriben juntas; la escena ya agrupa los repintados
+        for item, x, y in moves:
+            item.setPos(x, y)
+
+    def mousePressEvent(self, event):
+        # El bloque arrastrado se identifica al presionar; al soltar el cursor
+        # ya puede estar sobre otro bloque. itemAt (y no la celda de la grilla)
+        # porque un bloque arrastrado junto con una selección múltiple puede
+        # haber quedado fuera de su celda
+        item = self.itemAt(event.pos())
+        self._drag_block = self._get_block_from_item(item) if item is not None else None
+        super().mousePressEvent(event)
 
     def mouseReleaseEvent(self, event):
         """
         Cuando se suelta el mouse dentro del workspace:
-        - Si se soltó sobre un bloque, se calcula la nueva posición (fila, índice)
-          y se reordena la lista de esa fila.
+        - Si se estaba arrastrando un bloque, se calcula la nueva posición
+          (fila, índice) y se reordena la lista de esa fila.
+        - Los demás bloques seleccionados (que Qt arrastró junto con él)
+          vuelven a su celda.
         """
         super().mouseReleaseEvent(event)
 
-        # Buscar el item bajo el cursor
-        item = self.itemAt(event.pos())
-        if item is None:
-            return
-
-        # Si el item es texto hijo, subimos al padre
-        block = self._get_block_from_item(item)
-        if block is None:
+        block = self._drag_block
+        self._drag_block = None
+        if block is None or block not in self._blocks:
             return
 
         # Centro del bloque en coordenadas de escena
@@ -451,48 +553,67 @@ class WorkspaceView(QGraphicsView):
         new_row = self.row_from_y(center_scene.y())
 
         # Determinar índice destino aproximando por la X
-        row_items = self.rows[new_row]
-        if not row_items:
+        count = len(self.rows[new_row])
+        if not count:
             new_index = 0
         else:
             rel = (center_scene.x() - self.base_x) / self.col_width
             new_index = round(rel)
-            new_index = max(0, min(len(row_items), new_index))
+            new_index = max(0, min(count, new_index))
 
         # Respetar límite de columnas
-        if new_index >= self.max_cols:
-            new_index = self.max_cols - 1
+        max_cols = self.max_cols
+        if new_index >= max_cols:
+            new_index = max_cols - 1
 
         self.move_block_to(block, new_row, new_index)
 
+        # Bloques movidos junto con la selección: reacomodar sus filas
+        rows = set()
+        for item in self.scene().selectedItems():
+            other = self._get_block_from_item(item)
+            if other is not None and other is not block:
+                pos = self._block_pos.get(other)
+                if pos is not None:
+                    rows.add(pos[0])
+        for row in rows:
+            self.layout_row(row)
+
     def _get_block_from_item(self, item):
         """Si el item es un bloque o un hijo de bloque, devuelve el bloque."""
         it = item
         while it is not None:
-            if it.data(0) == "BLOCK":
+            if it in self._blocks:
                 return it
             it = it.parentItem()
         return None
 
     def move_block_to(self, block, new_row: int, new_index: int):
         """Reubica un bloque a (new_row, new_index) reordenando filas."""
-        old_row = block.data(1)
-        old_index = block.data(2)
-        if old_row is None:
+        pos = self._block_pos.get(block)
+        if pos is None:
             return
-        old_row = int(old_row)
-        old_index = int(old_index)
+        old_row, old_index = pos
 
         old_list = self.rows[old_row]
 
+        # Misma fila y mismo índice final: sólo volver a centrarlo en su celda
+        if new_row == old_row:
+            last = min(len(old_list) - 1, self.max_cols - 1)
+            if max(0, min(new_index, last)) == old_index:
+                self.set_block_center(block, self.grid_center(old_row, old_index))
+                return
+
         # Si el destino es otra fila ya llena, no permitimos el cambio: volvemos a su lugar
         if new_row != old_row and len(self.rows[new_row]) >= self.max_cols:
             self.layout_row(old_row)
             return
 
-        # Sacar el bloque de su fila anterior
-        if block in old_list:
-            old_list.remove(block)
+        # Sacar el bloque de su fila anterior: su índice ya está en _block_pos
+        old_list.pop(old_index)
+        # Quitar el último no corre a nadie; y si es la misma fila,
+        # el layout_row de abajo ya la reacomoda
+        if new_row != old_row and old_index < len(old_list):
             self.layout_row(old_row)
 
         # Insertar en la nueva fila
@@ -515,14 +636,17 @@ class WorkspaceView(QGraphicsView):
     # ------------------------------------------------------------------
     def delete_block(self, block):
         """Elimina un bloque de la escena y de la estructura rows."""
-        row = block.data(1)
-        if row is not None:
-            row = int(row)
-            if 0 <= row < len(self.rows):
-                row_list = self.rows[row]
-                if block in row_list:
-                    row_list.remove(block)
-                    self.layout_row(row)
+        pos = self._block_pos.pop(block, None)
+        self._block_offset.pop(block, None)
+        self._blocks.discard(block)
+        if pos is not None:
+            row, index = pos
+            # El índice guardado evita buscar el bloque en la fila
+            row_list = self.rows[row]
+            row_list.pop(index)
+            # Quitar el último no corre a nadie
+            if index < len(row_list):
+                self.layout_row(row)
         # Eliminar de la escena
         self.scene().removeItem(block)
 
@@ -1,4 +1,5 @@
 # session.py
+import sys
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
@@ -12,7 +13,11 @@ class BlockState:
     - row: índice de renglón (0..max_rows-1)
     - index: columna dentro de la fila (0..max_cols-1)
     - position: posición global secuencial (1,2,3,...)
+    La sesión devuelve una instancia nueva en cada consulta.
     """
+    # Sin __dict__ por instancia (equivale a slots=True, válido antes de Python 3.10)
+    __slots__ = ("id", "block_type", "row", "index", "position")
+
     id: int
     block_type: str
     row: int
@@ -41,9 +46,21 @@ class LadderSession:
             [None for _ in range(max_cols)] for _ in range(max_rows)
         ]
 
-        # Mapa id -> tipo de bloque (XIC, XIO, etc.)
+        # Mapa id -> tipo de bloque (XIC, XIO, etc.); los strings se internan,
+        # así todos los bloques de un mismo tipo comparten un único objeto
         self.block_types: Dict[int, str] = {}
 
+        # Índice id -> (row, col); se actualiza en cada escritura de la grilla
+        self._locations: Dict[int, Tuple[int, int]] = {}
+
+        # Tabla de posiciones globales: _positions[row][col] = row * max_cols + col + 1
+        self._positions: List[List[int]] = [
+            [r * max_cols + c + 1 for c in range(max_cols)] for r in range(max_rows)
+        ]
+
+        # Primera columna libre de cada fila (max_cols si la fila está llena)
+        self._first_free: List[int] = [0] * max_rows
+
         # Contador incremental para IDs
         self._next_id: int = 1
 
@@ -56,11 +73,25 @@ class LadderSession:
 
     def _find_block(self, block_id: int) -> Optional[Tuple[int, int]]:
         """Devuelve (row, col) donde está el bloque, o None si no existe."""
-        for r in range(self.max_rows):
-            for c in range(self.max_cols):
-                if self.grid[r][c] == block_id:
-                    return r, c
-        return None
+        return self._locations.get(block_id)
+
+    def _scan_free(self, row: int, start: int) -> int:
+        """Primera columna libre de 'row' desde 'start' (max_cols si no hay)."""
+        # list.index recorre la fila en C
+        try:
+            return self.grid[row].index(None, start)
+        except ValueError:
+            return self.max_cols
+
+    def _mark_filled(self, row: int, col: int) -> None:
+        """Actualiza _first_free después de ocupar grid[row][col]."""
+        if col == self._first_free[row]:
+            self._first_free[row] = self._scan_free(row, col + 1)
+
+    def _mark_freed(self, row: int, col: int) -> None:
+        """Actualiza _first_free después de vaciar grid[row][col]."""
+        if col < self._first_free[row]:
+            self._first_free[row] = col
 
     def _global_position(self, row: int, index: int) -> int:
         """
@@ -70,7 +101,7 @@ class LadderSession:
         - fila 1, col 0..5 -> pos 7..12
         etc.
         """
-        return row * self.max_cols + index + 1
+        return self._positions[row][index]
 
     # ------------------- API pública -------------------
     # ALTAS
@@ -84,20 +115,18 @@ class LadderSession:
         if not (0 <= row < self.max_rows):
             return None
 
-        # Buscar primera celda vacía (None)
-        free_col = None
-        for c in range(self.max_cols):
-            if self.grid[row][c] is None:
-                free_col = c
-                break
-
-        if free_col is None:
+        # Primera celda vacía (None), ya conocida
+        free_col = self._first_free[row]
+        if free_col >= self.max_cols:
             # fila llena
             return None
 
+        block_type = sys.intern(block_type)
         block_id = self._new_id()
         self.block_types[block_id] = block_type
         self.grid[row][free_col] = block_id
+        self._locations[block_id] = (row, free_col)
+        self._mark_filled(row, free_col)
 
         pos = self._global_position(row, free_col)
         return BlockState(
@@ -126,19 +155,25 @@ class LadderSession:
             return None
         if col < 0 or col >= self.max_cols:
             return None
+        # Fila llena: ni la celda está libre ni hay hueco para desplazar
+        if self._first_free[row] >= self.max_cols:
+            return None
 
+        block_type = sys.intern(block_type)
         block_id = self._new_id()
         self.block_types[block_id] = block_type
 
         # Si la celda está vacía, fácil
         if self.grid[row][col] is None:
             self.grid[row][col] = block_id
+            self._locations[block_id] = (row, col)
+            self._mark_filled(row, col)
             pos = self._global_position(row, col)
             return BlockState(block_id, block_type, row, col, pos)
 
         # La celda está ocupada -> desplazamiento
         placed = self._insert_with_shift(row, col, block_id, direction)
-        if not placed:
+        if placed is None:
             # no se pudo insertar, revertimos el registro del tipo
             self.block_types.pop(block_id, None)
             return None
@@ -147,6 +182,20 @@ class LadderSession:
         pos = self._global_position(row, final_col)
         return BlockState(block_id, block_type, row, final_col, pos)
 
+    def add_blocks(
+        self, plan: List[Tuple[int, str]]
+    ) -> List[Optional[BlockState]]:
+        """
+        Agrega varios bloques de una vez (por ejemplo, al cargar un programa).
+        plan: lista de (row, block_type); cada bloque va al PRIMER slot libre
+        de su fila, igual que add_block_first_free.
+
+        Devuelve un estado por entrada del plan, o None en las entradas cuya
+        fila estaba llena o era inválida.
+        """
+        add = self.add_block_first_free
+        return [add(row, block_type) for row, block_type in plan]
+
     # ------------------------------------------
     # MOVIMIENTOS
     # ------------------------------------------
@@ -162,7 +211,15 @@ class LadderSession:
             = 0 -> modo AUTO (primero intenta derecha, luego izquierda)
 
         Devuelve la columna final donde quedó block_id o None si fue imposible.
+        Mantiene actualizados _locations (bloques corridos) y _first_free.
         """
+        grid_row = self.grid[row]
+        locations = self._locations
+
+        def refresh_first_free(lo: int) -> None:
+            # Sólo cambiaron las celdas desde 'lo'; las anteriores siguen igual
+            if self._first_free[row] >= lo:
+                self._first_free[row] = self._scan_free(row, lo)
 
         def shift_right(start_col: int) -> Optional[int]:
             """
@@ -173,19 +230,24 @@ class LadderSession:
             # Buscar un hueco libre hacia la derecha
             free = None
             for c in range(self.max_cols - 1, start_col - 1, -1):
-                if self.grid[row][c] is None:
+                if grid_row[c] is None:
                     free = c
                     break
             if free is None:
                 return None
 
             # Desplazar todo a la derecha entre start_col..free-1
-            # (de derecha a izquierda para no pisar)
-            for c in range(free, start_col, -1):
-                self.grid[row][c] = self.grid[row][c - 1]
+            # (una sola asignación por slice: la copia se hace en C)
+            grid_row[start_col + 1:free + 1] = grid_row[start_col:free]
+            for c in range(start_col + 1, free + 1):
+                moved = grid_row[c]
+                if moved is not None:
+                    locations[moved] = (row, c)
 
             # Insertar en start_col
-            self.grid[row][start_col] = block_id
+            grid_row[start_col] = block_id
+            locations[block_id] = (row, start_col)
+            refresh_first_free(start_col)
             return start_col
 
         def shift_left(start_col: int) -> Optional[int]:
@@ -193,19 +255,21 @@ class LadderSession:
             Intenta abrir espacio en 'start_col' desplazando hacia la izquierda.
             Devuelve la col donde se inserta el bloque o None si no hay espacio.
             """
-            free = None
-            for c in range(0, start_col + 1):
-                if self.grid[row][c] is None:
-                    free = c
-                    break
-            if free is None:
+            try:
+                free = grid_row.index(None, 0, start_col + 1)
+            except ValueError:
                 return None
 
             # Desplazar todo a la izquierda entre free+1..start_col
+            grid_row[free:start_col] = grid_row[free + 1:start_col + 1]
             for c in range(free, start_col):
-                self.grid[row][c] = self.grid[row][c + 1]
+                moved = grid_row[c]
+                if moved is not None:
+                    locations[moved] = (row, c)
 
-            self.grid[row][start_col] = block_id
+            grid_row[start_col] = block_id
+            locations[block_id] = (row, start_col)
+            refresh_first_free(free)
             return start_col
 
         if direction > 0:  # derecha
@@ -247,28 +311,35 @@ class LadderSession:
         if not (0 <= new_row < self.max_rows):
             new_row = old_row
 
-        if target_col < 0:
-            target_col = 0
-        if target_col >= self.max_cols:
-            target_col = self.max_cols - 1
+        # Columna acotada a 0..max_cols-1
+        target_col = min(max(target_col, 0), self.max_cols - 1)
 
         # Si se queda en la misma celda, nada que hacer
         if old_row == new_row and old_col == target_col:
             return ( (old_row, old_col), (new_row, target_col) )
 
+        # Otra fila ya llena: no hay lugar, sin tocar la grilla
+        if new_row != old_row and self._first_free[new_row] >= self.max_cols:
+            return None
+
         # Quitamos el bloque de su posición actual
         self.grid[old_row][old_col] = None
+        self._mark_freed(old_row, old_col)
 
         # Caso 1: celda destino libre -> se pone ahí
         if self.grid[new_row][target_col] is None:
             self.grid[new_row][target_col] = block_id
+            self._locations[block_id] = (new_row, target_col)
+            self._mark_filled(new_row, target_col)
             return ( (old_row, old_col), (new_row, target_col) )
 
         # Caso 2: hay algo en ese slot -> insert con desplazamiento
         placed_col = self._insert_with_shift(new_row, target_col, block_id, direction)
         if placed_col is None:
             # No se pudo insertar -> devolvemos el bloque a su lugar original
+            # (_insert_with_shift no tocó la grilla ni el índice)
             self.grid[old_row][old_col] = block_id
+            self._mark_filled(old_row, old_col)
             return None
 
         return ( (old_row, old_col), (new_row, placed_col) )
@@ -288,7 +359,9 @@ class LadderSession:
 
         row, col = found
         self.grid[row][col] = None
+        self._mark_freed(row, col)
         self.block_types.pop(block_id, None)
+        self._locations.pop(block_id, None)
         return row, col
 
     # ------------------------------------------
@@ -311,21 +384,12 @@ class LadderSession:
         Devuelve una lista con el estado de TODOS los bloques.
         Útil para exportar el "programa".
         """
-        snapshot: List[BlockState] = []
-        for r in range(self.max_rows):
-            for c in range(self.max_cols):
-                bid = self.grid[r][c]
-                if bid is None:
-                    continue
-                btype = self.block_types.get(bid, "UNKNOWN")
-                pos = self._global_position(r, c)
-                snapshot.append(
-                    BlockState(
-                        id=bid,
-                        block_type=btype,
-                        row=r,
-                        index=c,
-                        position=pos,
-                    )
-                )
-        return snapshot
\ No newline at end of file
+        # Un solo recorrido por fila, con los lookups ligados a locales
+        block_types = self.block_types
+        positions = self._positions
+        return [
+            BlockState(bid, block_types.get(bid, "UNKNOWN"), r, c, positions[r][c])
+            for r, grid_row in enumerate(self.grid)
+            for c, bid in enumerate(grid_row)
+            if bid is not None
+        ]
\ No newline at end of file